@@ -2,17 +2,53 @@
 MCP OpenHEXA Server - Main server implementation using FastMCP
 """
 
-import base64
-import io
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
 import os
 import sys
-import zipfile
+import threading
 from typing import Any
 
 import requests
 from dotenv import load_dotenv
 from fastmcp import FastMCP
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# cachetools is optional: without it, responses are simply not cached.
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+# orjson is optional: it decodes the kB-MB GraphQL payloads noticeably faster
+# than the stdlib json module; the loader is bound once so the hot path pays
+# no per-call dispatch. Both loaders take bytes, skipping requests' charset
+# sniffing and .text decode.
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# pysimdjson is optional: its lazy document API lets the file-preview path
+# read a handful of leaves out of a large payload without materializing the
+# whole response as Python objects. The parser instance is reusable but not
+# thread-safe, and each parse invalidates the previous document, so all
+# parse-to-leaf-extraction work happens under _SIMDJSON_LOCK.
+try:
+    import simdjson
+
+    _simdjson_parser = simdjson.Parser()
+except ImportError:
+    simdjson = None
+    _simdjson_parser = None
+_SIMDJSON_LOCK = threading.Lock()
 
 
 # Load environment variables if available
@@ -24,19 +60,388 @@ try:
 except Exception:
     openhexa = None
 
+# Read credentials once at import: they cannot change for the lifetime of
+# the process, and binding the auth header up front spares an env lookup and
+# f-string format on every call.
+_URL = os.environ.get("HEXA_SERVER_URL")
+_TOKEN = os.environ.get("HEXA_TOKEN")
+_HEADERS = (
+    {"Authorization": f"Bearer {_TOKEN}", "Content-Type": "application/json"}
+    if _TOKEN
+    else {}
+)
+
 # Check SDK availability and required credentials.
-OPENHEXA_AVAILABLE = (
-    bool(openhexa)
-    and bool(os.environ.get("HEXA_SERVER_URL"))
-    and bool(os.environ.get("HEXA_TOKEN"))
+OPENHEXA_AVAILABLE = bool(openhexa) and bool(_URL) and bool(_TOKEN)
+
+# One pooled keep-alive session for the whole (long-lived) MCP process, so
+# repeated GraphQL calls skip TCP + TLS setup, with backoff on transient
+# connection failures. Everything on this session is a POST (and the SDK
+# also sends mutations through it), so status-based retries on 429/5xx are
+# deliberately not configured: replaying a POST after, say, a 502 that
+# followed a successful createPipeline would duplicate the mutation. Only
+# connect errors — where the request never reached the server — retry.
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, connect=3, backoff_factor=0.3),
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+if _HEADERS:
+    _session.headers.update(_HEADERS)
+if openhexa is not None:
+    # Best effort: the SDK exposes its transport session under different
+    # attribute names depending on the version.
+    for _attr in ("session", "_session"):
+        if hasattr(openhexa, _attr):
+            setattr(openhexa, _attr, _session)
+            break
+
+# httpx (with the h2 extra) is optional: when present, direct GraphQL posts
+# go over one HTTP/2 connection, so parallel tool calls multiplex instead of
+# each taking a socket from the pool.
+try:
+    import httpx
+
+    _http = httpx.Client(
+        http2=True,
+        timeout=30,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=16),
+        headers=_HEADERS or None,
+    )
+except ImportError:
+    httpx = None
+    _http = None
+
+# Errors that mean "the direct transport failed, fall back to the SDK".
+_TRANSPORT_ERRORS = (
+    (requests.RequestException, httpx.HTTPError) if httpx is not None else (requests.RequestException,)
 )
 
 
+def _post(endpoint: str, payload: dict):
+    """POST a GraphQL payload over the best available transport.
+
+    Non-2xx responses raise (a transport error for callers), so an auth or
+    gateway error page never reaches the JSON parsers and the SDK fallback
+    actually engages.
+    """
+    if _http is not None:
+        response = _http.post(endpoint, json=payload)
+    else:
+        response = _session.post(endpoint, json=payload, timeout=30)
+    response.raise_for_status()
+    return response
+
+
+def _jsonable(value):
+    """Default hook: unpack slotted result records at the serializer boundary."""
+    as_dict = getattr(value, "_as_dict", None)
+    if as_dict is not None:
+        return as_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _serialize_tool_result(value) -> str:
+    """Serialize tool results for the MCP transport with orjson when available.
+
+    Returning simdjson views directly was considered and rejected: views are
+    invalidated by the shared parser's next parse, so results must be plain
+    Python by the time they leave a tool. Doing the final dump with orjson
+    recovers most of that re-serialization cost on large preview payloads.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_jsonable).decode()
+    return json.dumps(value, default=_jsonable)
+
+
 # Create the MCP server
-mcp = FastMCP("OpenHEXA")
+mcp = FastMCP("OpenHEXA", tool_serializer=_serialize_tool_result)
+
+
+# Short-lived response cache: repeated tool calls (and search_resources, which
+# fans out to several listings) often re-ask the exact same query within
+# seconds. 30s is short enough that mutations done elsewhere become visible
+# quickly. Mutations must never go through this cache.
+_RESP_CACHE = TTLCache(maxsize=512, ttl=30) if TTLCache is not None else None
+# cachetools caches are not thread-safe, and tools run concurrently on worker
+# threads (require_sdk dispatches sync bodies via to_thread); every cache
+# access goes through this lock.
+_RESP_CACHE_LOCK = threading.Lock()
+
+
+def _parse(result) -> dict:
+    """Decode a GraphQL HTTP response body, preferring orjson when installed.
+
+    Some SDK versions hand back an already-parsed dict; pass it through
+    rather than re-serializing. Bodies are always parsed from the raw bytes
+    (requests and httpx both decompress into .content), never from .text,
+    which would force a full str decode of the payload first.
+    """
+    if isinstance(result, dict):
+        return result
+    content = getattr(result, "content", None)
+    if content is not None:
+        return _loads(content)
+    return result.json()
+
+
+def _cache_key(name: str, payload: dict | None) -> str:
+    raw = name + json.dumps(payload or {}, sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+# Automatic Persisted Queries (APQ): send a sha256 of the document instead
+# of the full multi-KB string, and fall back to the full query whenever the
+# hash-only attempt does not produce a clean response. Hashes are memoized
+# per document; any hash-only failure other than the standard Apollo
+# PersistedQueryNotFound handshake (a backend that does not speak APQ
+# answers with its own error, a 400, or a non-JSON page) disables APQ for
+# the rest of the process.
+_QUERY_HASHES: dict[str, str] = {}
+_APQ_ENABLED = True
+
+
+def _query_hash(query: str) -> str:
+    digest = _QUERY_HASHES.get(query)
+    if digest is None:
+        digest = _QUERY_HASHES[query] = hashlib.sha256(query.encode()).hexdigest()
+    return digest
+
+
+def _apq_not_found(response_data: dict) -> bool:
+    return any(
+        error.get("message") == "PersistedQueryNotFound"
+        for error in response_data.get("errors") or []
+    )
+
+
+def _execute(query: str, variables: dict | None = None) -> dict:
+    """POST a GraphQL document, attempting the APQ handshake when possible."""
+    global _APQ_ENABLED
+    if not _URL or not _APQ_ENABLED:
+        return _parse(openhexa.execute(query=query, variables=variables))
+    endpoint = _URL.rstrip("/") + "/graphql"
+    payload = {
+        "variables": variables or {},
+        "extensions": {"persistedQuery": {"version": 1, "sha256Hash": _query_hash(query)}},
+    }
+    try:
+        # Any failed hash-only attempt retries once with the full document:
+        # a backend without APQ support answers the hash with its own error,
+        # which must never be returned as if it were the result. Only the
+        # standard PersistedQueryNotFound handshake keeps APQ enabled.
+        try:
+            response_data = _parse(_post(endpoint, payload))
+        except (*_TRANSPORT_ERRORS, ValueError):
+            response_data = None
+        if isinstance(response_data, dict) and "errors" not in response_data:
+            return response_data
+        if not (isinstance(response_data, dict) and _apq_not_found(response_data)):
+            _APQ_ENABLED = False
+        payload["query"] = query
+        return _parse(_post(endpoint, payload))
+    except _TRANSPORT_ERRORS:
+        # Direct endpoint unreachable or mangled; the SDK remains the
+        # authoritative transport.
+        return _parse(openhexa.execute(query=query, variables=variables))
+
+
+# Bodies announced above this size stream into one preallocated buffer
+# instead of whatever intermediate chunks the client accumulates.
+_STREAM_THRESHOLD = 64 * 1024
+
+
+def _post_body(endpoint: str, payload: dict) -> bytes:
+    """POST a GraphQL payload and return the body bytes.
+
+    With httpx, large announced bodies (Content-Length past the threshold)
+    are streamed directly into a single preallocated bytearray, bounding
+    peak memory to the payload size; small or chunked responses keep the
+    plain fast path.
+    """
+    if _http is None:
+        response = _session.post(endpoint, json=payload, timeout=30)
+        response.raise_for_status()
+        return response.content
+    with _http.stream("POST", endpoint, json=payload) as response:
+        response.raise_for_status()
+        length = int(response.headers.get("Content-Length") or 0)
+        if length <= _STREAM_THRESHOLD:
+            return response.read()
+        buffer = bytearray(length)
+        view = memoryview(buffer)
+        offset = 0
+        for chunk in response.iter_bytes():
+            end = offset + len(chunk)
+            if end > length:
+                # Server sent more than announced; fall back to appending.
+                return bytes(view[:offset]) + chunk + response.read()
+            view[offset:end] = chunk
+            offset = end
+        return buffer if offset == length else bytes(view[:offset])
+
+
+def _execute_raw(query: str, variables: dict | None = None):
+    """Run a query and return the raw response body as bytes.
+
+    Shares the APQ handshake with _execute so the stable document constants
+    keep their server-side hash-cache hit rate, while callers that parse
+    lazily never pay for a dict they don't need. When only the SDK transport
+    is available and it hands back parsed data, the dict is returned as-is.
+    """
+    global _APQ_ENABLED
+    if not _URL or not _APQ_ENABLED:
+        result = openhexa.execute(query=query, variables=variables)
+        content = getattr(result, "content", None)
+        return content if content is not None else _parse(result)
+    endpoint = _URL.rstrip("/") + "/graphql"
+    payload = {
+        "variables": variables or {},
+        "extensions": {"persistedQuery": {"version": 1, "sha256Hash": _query_hash(query)}},
+    }
+    try:
+        retry_keeps_apq = False
+        try:
+            body = _post_body(endpoint, payload)
+        except _TRANSPORT_ERRORS:
+            body = None
+        if body is not None:
+            # Cheap bytes probe before parsing: error-free bodies (the common
+            # case after warm-up) return without a parse.
+            if b'"errors"' not in body:
+                return body
+            try:
+                response_data = _loads(body)
+            except ValueError:
+                response_data = None
+            if isinstance(response_data, dict):
+                if "errors" not in response_data:
+                    # The probe matched inside the payload itself.
+                    return body
+                retry_keeps_apq = _apq_not_found(response_data)
+        # Anything but the standard PersistedQueryNotFound handshake — a
+        # non-APQ backend's own error, a non-JSON body, a transport failure —
+        # means hash-only requests do not work here; stop sending them.
+        if not retry_keeps_apq:
+            _APQ_ENABLED = False
+        payload["query"] = query
+        return _post_body(endpoint, payload)
+    except _TRANSPORT_ERRORS:
+        result = openhexa.execute(query=query, variables=variables)
+        content = getattr(result, "content", None)
+        return content if content is not None else _parse(result)
+
+
+def _cached_execute(query: str, variables: dict | None = None) -> dict:
+    """Run a read-only GraphQL query, serving repeats from the TTL cache."""
+    if _RESP_CACHE is None:
+        return _execute(query, variables)
+    key = _cache_key(query, variables)
+    with _RESP_CACHE_LOCK:
+        cached = _RESP_CACHE.get(key)
+    if cached is not None:
+        return cached
+    response_data = _execute(query, variables)
+    if "errors" not in response_data:
+        with _RESP_CACHE_LOCK:
+            _RESP_CACHE[key] = response_data
+    return response_data
+
+
+def _cached_call(name: str, fn, **kwargs):
+    """Memoize a read-only SDK call for the cache TTL, keyed by name + kwargs."""
+    if _RESP_CACHE is None:
+        return fn(**kwargs)
+    key = _cache_key(name, kwargs)
+    with _RESP_CACHE_LOCK:
+        cached = _RESP_CACHE.get(key)
+    if cached is not None:
+        return cached
+    result = fn(**kwargs)
+    with _RESP_CACHE_LOCK:
+        _RESP_CACHE[key] = result
+    return result
+
+
+# Bulk pydantic serialization: TypeAdapter(list[Model]).dump_python pushes a
+# whole page through pydantic-core in one call instead of looping model_dump
+# per item. Adapters are built lazily from the first item's class and cached.
+try:
+    from pydantic import TypeAdapter
+except ImportError:
+    TypeAdapter = None
+
+_ADAPTERS: dict[type, Any] = {}
+
+
+def _dump_items(items) -> list[dict]:
+    items = list(items)
+    if not items or TypeAdapter is None:
+        return [item.model_dump() for item in items]
+    model = type(items[0])
+    adapter = _ADAPTERS.get(model)
+    if adapter is None:
+        adapter = _ADAPTERS[model] = TypeAdapter(list[model])
+    return adapter.dump_python(items)
+
+
+# Shared, pre-built error payload: every guarded tool returns the same object
+# instead of constructing a fresh dict on each unavailable call.
+_SDK_UNAVAILABLE = {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
+
+
+def require_sdk(fn):
+    """Guard a tool behind SDK availability and turn unexpected errors into payloads.
+
+    The returned wrapper is always a coroutine function: sync tool bodies run
+    via asyncio.to_thread so their blocking HTTP calls never stall FastMCP's
+    event loop, and concurrent MCP clients no longer serialize behind each
+    other.
+    """
+    if asyncio.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            if not OPENHEXA_AVAILABLE:
+                return _SDK_UNAVAILABLE
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                return {"error": str(e)}
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if not OPENHEXA_AVAILABLE:
+            return _SDK_UNAVAILABLE
+        try:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        except Exception as e:
+            return {"error": str(e)}
+
+    return wrapper
+
+
+@mcp.tool
+def clear_cache() -> dict:
+    """Clear the response and file-preview caches (use after out-of-band changes)."""
+    cleared = 0
+    if _RESP_CACHE is not None:
+        with _RESP_CACHE_LOCK:
+            cleared = len(_RESP_CACHE)
+            _RESP_CACHE.clear()
+    previews_cleared = _fetch_sample.cache_info().currsize
+    _fetch_sample.cache_clear()
+    return {"success": True, "cleared": cleared, "previews_cleared": previews_cleared}
 
 
 @mcp.tool
+@require_sdk
 def list_workspaces(page: int = 1, per_page: int = 10) -> dict:
     """
     List all available workspaces.
@@ -53,39 +458,53 @@ def list_workspaces(page: int = 1, per_page: int = 10) -> dict:
         - per_page: Number of items per page
         - count: Number of items in current page
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-
-    try:
-        workspaces_page = openhexa.workspaces(page=page, per_page=per_page)
-        return {
-            "workspaces": [w.model_dump() for w in workspaces_page.items],
-            "total_pages": workspaces_page.total_pages,
-            "current_page": page,
-            "per_page": per_page,
-            "count": len(workspaces_page.items),
-        }
-    except Exception as e:
-        return {"error": str(e)}
+    workspaces_page = _cached_call(
+        "workspaces", openhexa.workspaces, page=page, per_page=per_page
+    )
+    return {
+        "workspaces": _dump_items(workspaces_page.items),
+        "total_pages": workspaces_page.total_pages,
+        "current_page": page,
+        "per_page": per_page,
+        "count": len(workspaces_page.items),
+    }
 
 
 @mcp.tool
+@require_sdk
 def get_workspace_details(workspace_slug: str) -> dict:
     """Get details for a specific workspace."""
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
+    workspace = openhexa.workspace(slug=workspace_slug)
+    if workspace:
+        return workspace.model_dump()
+    else:
+        return {"error": f"Workspace '{workspace_slug}' not found"}
 
-    try:
-        workspace = openhexa.workspace(slug=workspace_slug)
-        if workspace:
-            return workspace.model_dump()
-        else:
-            return {"error": f"Workspace '{workspace_slug}' not found"}
-    except Exception as e:
-        return {"error": str(e)}
+
+_Q_WORKSPACE_DATASETS = """
+    query workspaceDatasets($slug: String!, $page: Int!, $perPage: Int!) {
+        workspace(slug: $slug) {
+            datasets(page: $page, perPage: $perPage) {
+                items {
+                    dataset {
+                        id
+                        name
+                        slug
+                        description
+                        createdAt
+                        updatedAt
+                    }
+                }
+                totalItems
+                totalPages
+            }
+        }
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def list_datasets(page: int = 1, per_page: int = 10, workspace_slug: str | None = None) -> dict:
     """
     List datasets.
@@ -103,42 +522,52 @@ def list_datasets(page: int = 1, per_page: int = 10, workspace_slug: str | None
         - per_page: Number of items per page
         - count: Number of items in current page
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-
-    try:
-        datasets_page = openhexa.datasets(page=page, per_page=per_page)
-        datasets = [d.model_dump() for d in datasets_page.items]
-        if workspace_slug:
-            datasets = [d for d in datasets if d.get("workspace", {}).get("slug") == workspace_slug]
+    if workspace_slug:
+        # Scope server-side through the workspace's dataset links so the
+        # page numbers and totals refer to the workspace, not to a filtered
+        # slice of the global listing.
+        response_data = _cached_execute(
+            _Q_WORKSPACE_DATASETS,
+            {"slug": workspace_slug, "page": page, "perPage": per_page},
+        )
+        if "errors" in response_data:
+            return {"error": f"GraphQL error: {response_data['errors']}"}
+        workspace = response_data["data"].get("workspace")
+        if not workspace:
+            return {"error": f"Workspace '{workspace_slug}' not found"}
+        datasets_info = workspace.get("datasets", {})
+        datasets = [link["dataset"] for link in datasets_info.get("items", [])]
         return {
             "datasets": datasets,
-            "total_pages": datasets_page.total_pages,
+            "total_pages": datasets_info.get("totalPages", 0),
             "current_page": page,
             "per_page": per_page,
             "count": len(datasets),
         }
-    except Exception as e:
-        return {"error": str(e)}
+    datasets_page = _cached_call("datasets", openhexa.datasets, page=page, per_page=per_page)
+    datasets = _dump_items(datasets_page.items)
+    return {
+        "datasets": datasets,
+        "total_pages": datasets_page.total_pages,
+        "current_page": page,
+        "per_page": per_page,
+        "count": len(datasets),
+    }
 
 
 @mcp.tool
+@require_sdk
 def get_dataset_details(dataset_id: str) -> dict:
     """Get details for a specific dataset by ID."""
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-
-    try:
-        dataset = openhexa.dataset(id=dataset_id)
-        if dataset:
-            return dataset.model_dump()
-        else:
-            return {"error": f"Dataset with ID '{dataset_id}' not found"}
-    except Exception as e:
-        return {"error": str(e)}
+    dataset = openhexa.dataset(id=dataset_id)
+    if dataset:
+        return dataset.model_dump()
+    else:
+        return {"error": f"Dataset with ID '{dataset_id}' not found"}
 
 
 @mcp.tool
+@require_sdk
 def list_pipelines(workspace_slug: str, page: int = 1, per_page: int = 10) -> dict:
     """
     List pipelines for a workspace.
@@ -156,62 +585,87 @@ def list_pipelines(workspace_slug: str, page: int = 1, per_page: int = 10) -> di
         - per_page: Number of items per page
         - count: Number of items in current page
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-
-    try:
-        pipelines_page = openhexa.pipelines(
-            workspace_slug=workspace_slug, page=page, per_page=per_page
-        )
-        return {
-            "pipelines": [p.model_dump() for p in pipelines_page.items],
-            "total_pages": pipelines_page.total_pages,
-            "current_page": page,
-            "per_page": per_page,
-            "count": len(pipelines_page.items),
-        }
-    except Exception as e:
-        return {"error": str(e)}
+    pipelines_page = _cached_call(
+        "pipelines", openhexa.pipelines, workspace_slug=workspace_slug, page=page, per_page=per_page
+    )
+    return {
+        "pipelines": _dump_items(pipelines_page.items),
+        "total_pages": pipelines_page.total_pages,
+        "current_page": page,
+        "per_page": per_page,
+        "count": len(pipelines_page.items),
+    }
 
 
 @mcp.tool
+@require_sdk
 def get_pipeline_details(workspace_slug: str, pipeline_code: str) -> dict:
     """Get details for a specific pipeline in a workspace."""
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-
-    try:
-        pipeline = openhexa.pipeline(workspace_slug=workspace_slug, pipeline_code=pipeline_code)
-        if pipeline:
-            return pipeline.model_dump()
-        else:
-            return {
-                "error": f"Pipeline '{pipeline_code}' not found in workspace '{workspace_slug}'"
-            }
-    except Exception as e:
-        return {"error": str(e)}
+    pipeline = openhexa.pipeline(workspace_slug=workspace_slug, pipeline_code=pipeline_code)
+    if pipeline:
+        return pipeline.model_dump()
+    else:
+        return {
+            "error": f"Pipeline '{pipeline_code}' not found in workspace '{workspace_slug}'"
+        }
 
 
 @mcp.tool
+@require_sdk
 def get_pipeline_runs(workspace_slug: str, pipeline_code: str) -> dict:
     """Get runs for a specific pipeline in a workspace."""
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
+    pipeline = openhexa.pipeline(workspace_slug=workspace_slug, pipeline_code=pipeline_code)
+    if pipeline:
+        runs = pipeline.runs
+        return {"runs": _dump_items(runs.items), "count": len(runs.items)}
+    else:
+        return {
+            "error": f"Pipeline '{pipeline_code}' not found in workspace '{workspace_slug}'"
+        }
 
-    try:
-        pipeline = openhexa.pipeline(workspace_slug=workspace_slug, pipeline_code=pipeline_code)
-        if pipeline:
-            runs = pipeline.runs
-            return {"runs": [r.model_dump() for r in runs.items], "count": len(runs.items)}
-        else:
-            return {
-                "error": f"Pipeline '{pipeline_code}' not found in workspace '{workspace_slug}'"
+
+_Q_PIPELINE_CODE = """
+    query getPipelineCode($workspaceSlug: String!, $code: String!) {
+        pipelineByCode(workspaceSlug: $workspaceSlug, code: $code) {
+            id
+            name
+            code
+            description
+            currentVersion {
+                id
+                versionNumber
+                versionName
+                description
+                createdAt
+                parameters {
+                    code
+                    name
+                    type
+                    required
+                    default
+                    help
+                }
+                files {
+                    id
+                    name
+                    path
+                    type
+                    content
+                    language
+                    lineCount
+                }
             }
-    except Exception as e:
-        return {"error": str(e)}
+            workspace {
+                slug
+                name
+            }
+        }
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def get_pipeline_code(
     workspace_slug: str,
     pipeline_code: str,
@@ -238,112 +692,99 @@ def get_pipeline_code(
             - lineCount: Number of lines
         - parameters: Pipeline parameters with types and defaults
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure credentials."}
-
-    try:
-        query = """
-        query getPipelineCode($workspaceSlug: String!, $code: String!) {
-            pipelineByCode(workspaceSlug: $workspaceSlug, code: $code) {
-                id
-                name
-                code
-                description
-                currentVersion {
-                    id
-                    versionNumber
-                    versionName
-                    description
-                    createdAt
-                    parameters {
-                        code
-                        name
-                        type
-                        required
-                        default
-                        help
-                    }
-                    files {
-                        id
-                        name
-                        path
-                        type
-                        content
-                        language
-                        lineCount
-                    }
-                }
-                workspace {
-                    slug
-                    name
-                }
-            }
-        }
-        """
-
-        variables = {
-            "workspaceSlug": workspace_slug,
-            "code": pipeline_code,
-        }
+    query = _Q_PIPELINE_CODE
 
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
+    variables = {
+        "workspaceSlug": workspace_slug,
+        "code": pipeline_code,
+    }
 
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
+    response_data = _cached_execute(query, variables)
 
-        pipeline = response_data.get("data", {}).get("pipelineByCode")
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
 
-        if not pipeline:
-            return {
-                "error": f"Pipeline '{pipeline_code}' not found in workspace '{workspace_slug}'"
-            }
+    pipeline = response_data["data"].get("pipelineByCode")
 
-        current_version = pipeline.get("currentVersion")
-        if not current_version:
-            return {
-                "error": f"Pipeline '{pipeline_code}' has no versions yet",
-                "pipeline": {
-                    "id": pipeline.get("id"),
-                    "name": pipeline.get("name"),
-                    "code": pipeline.get("code"),
-                },
-            }
+    if not pipeline:
+        return {
+            "error": f"Pipeline '{pipeline_code}' not found in workspace '{workspace_slug}'"
+        }
 
+    current_version = pipeline.get("currentVersion")
+    if not current_version:
         return {
+            "error": f"Pipeline '{pipeline_code}' has no versions yet",
             "pipeline": {
                 "id": pipeline.get("id"),
                 "name": pipeline.get("name"),
                 "code": pipeline.get("code"),
-                "description": pipeline.get("description"),
-            },
-            "version": {
-                "id": current_version.get("id"),
-                "versionNumber": current_version.get("versionNumber"),
-                "versionName": current_version.get("versionName"),
-                "description": current_version.get("description"),
-                "createdAt": current_version.get("createdAt"),
             },
-            "files": current_version.get("files", []),
-            "parameters": current_version.get("parameters", []),
-            "workspace": pipeline.get("workspace"),
         }
 
-    except Exception as e:
-        return {"error": "Failed to get pipeline code: " + str(e)}
+    return {
+        "pipeline": {
+            "id": pipeline.get("id"),
+            "name": pipeline.get("name"),
+            "code": pipeline.get("code"),
+            "description": pipeline.get("description"),
+        },
+        "version": {
+            "id": current_version.get("id"),
+            "versionNumber": current_version.get("versionNumber"),
+            "versionName": current_version.get("versionName"),
+            "description": current_version.get("description"),
+            "createdAt": current_version.get("createdAt"),
+        },
+        "files": current_version.get("files", []),
+        "parameters": current_version.get("parameters", []),
+        "workspace": pipeline.get("workspace"),
+    }
 
 
 @mcp.tool
-def list_workspace_members(workspace_slug: str) -> dict:
-    """List members of a workspace."""
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
+@require_sdk
+def list_workspace_members(workspace_slug: str, page: int = 1, per_page: int = 20) -> dict:
+    """List members of a workspace.
 
-    try:
-        members = openhexa.get_users(query="", workspace_slug=workspace_slug)
-        return {"members": [m.model_dump() for m in members], "count": len(members)}
-    except Exception as e:
-        return {"error": str(e)}
+    Args:
+        workspace_slug: The workspace slug
+        page: Page number (default: 1)
+        per_page: Number of members per page (default: 20)
+    """
+    members = openhexa.get_users(query="", workspace_slug=workspace_slug)
+    start = (page - 1) * per_page
+    page_items = members[start : start + per_page]
+    return {
+        "members": _dump_items(page_items),
+        "count": len(page_items),
+        "total_items": len(members),
+        "current_page": page,
+        "per_page": per_page,
+    }
+
+
+# Fixed ZIP entry timestamp (the format's epoch) so identical inputs always
+# produce byte-identical archives, which keeps payloads cache-friendly.
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# Below this size DEFLATE overhead dominates and saves next to nothing; store
+# tiny entries as-is (base64 inflation is unchanged either way).
+_ZIP_STORE_THRESHOLD = 4096
+
+# Block size for chunked base64 encoding of large archives; 57 KiB is a
+# multiple of 3 bytes, so per-block encodings concatenate without padding.
+_B64_CHUNK_BYTES = 57 * 1024
+
+
+def _zip_entry(filename: str, content: str | bytes) -> "zipfile.ZipInfo":
+    import zipfile
+
+    info = zipfile.ZipInfo(filename, date_time=_ZIP_EPOCH)
+    info.compress_type = (
+        zipfile.ZIP_STORED if len(content) < _ZIP_STORE_THRESHOLD else zipfile.ZIP_DEFLATED
+    )
+    return info
 
 
 def _create_pipeline_zipfile(
@@ -372,15 +813,22 @@ def _create_pipeline_zipfile(
     Returns:
         Base64-encoded ZIP file string
     """
-    # Create in-memory ZIP
+    # Imported here rather than at module top: only the pipeline-upload path
+    # needs them, and the module cache makes repeat calls free.
+    import base64
+    import io
+    import zipfile
+
+    # Create in-memory ZIP. compresslevel=1 is several times faster than the
+    # default on source text for a negligible size penalty.
     zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
         # Main pipeline file (required)
-        zip_file.writestr("pipeline.py", code_content)
+        zip_file.writestr(_zip_entry("pipeline.py", code_content), code_content)
 
         # Requirements file (optional)
         if requirements_txt:
-            zip_file.writestr("requirements.txt", requirements_txt)
+            zip_file.writestr(_zip_entry("requirements.txt", requirements_txt), requirements_txt)
 
         # Additional utility files (optional)
         if util_files:
@@ -388,14 +836,51 @@ def _create_pipeline_zipfile(
                 # Ensure .py extension and prevent overwriting pipeline.py
                 if filename == "pipeline.py":
                     continue  # Skip, pipeline.py is already added
-                zip_file.writestr(filename, content)
+                zip_file.writestr(_zip_entry(filename, content), content)
+
+    # Encode straight off the buffer's memoryview - no getvalue() copy - and
+    # decode as ascii (base64 output is ascii by construction). Archives past
+    # the threshold are encoded in 57 KiB blocks (a multiple of base64's
+    # 3-byte groups, so the pieces concatenate without padding) to keep peak
+    # memory bounded instead of allocating 1.33x the zip in one shot.
+    buffer_view = zip_buffer.getbuffer()
+    if len(buffer_view) <= _B64_CHUNK_BYTES:
+        return base64.b64encode(buffer_view).decode("ascii")
+    return b"".join(
+        base64.b64encode(buffer_view[offset : offset + _B64_CHUNK_BYTES])
+        for offset in range(0, len(buffer_view), _B64_CHUNK_BYTES)
+    ).decode("ascii")
+
+
+_M_CREATE_PIPELINE = """
+        mutation createPipeline($input: CreatePipelineInput!) {
+            createPipeline(input: $input) {
+                success
+                errors
+                pipeline {
+                    id
+                    name
+                    code
+                    type
+                    workspace { slug }
+                }
+            }
+        }
+"""
 
-    # Get ZIP bytes and encode to base64
-    zip_bytes = zip_buffer.getvalue()
-    return base64.b64encode(zip_bytes).decode("utf-8")
+
+_M_UPLOAD_INITIAL_VERSION = """
+        mutation uploadPipeline($input: UploadPipelineInput!) {
+            uploadPipeline(input: $input) {
+                success
+                errors
+            }
+        }
+"""
 
 
 @mcp.tool
+@require_sdk
 def create_pipeline(
     workspace_slug: str,
     name: str,
@@ -425,135 +910,131 @@ def create_pipeline(
     Returns:
         Dict containing the created pipeline details and upload status
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-
-    try:
-        # Validate inputs
-        if not workspace_slug or not name or not code_content:
-            return {"error": "workspace_slug, name, and code_content are required"}
-
-        # Step 1: Create the pipeline entity
-        create_query = """
-            mutation createPipeline($input: CreatePipelineInput!) {
-                createPipeline(input: $input) {
-                    success
-                    errors
-                    pipeline {
-                        id
-                        name
-                        code
-                        type
-                        workspace { slug }
-                    }
-                }
-            }
-        """
-
-        create_input = {
-            "name": name,
-            "workspaceSlug": workspace_slug,
-        }
+    # Validate inputs
+    if not workspace_slug or not name or not code_content:
+        return {"error": "workspace_slug, name, and code_content are required"}
 
-        if functional_type:
-            create_input["functionalType"] = functional_type.lower()
+    # Step 1: Create the pipeline entity
+    create_query = _M_CREATE_PIPELINE
 
-        if tags:
-            create_input["tags"] = tags
+    create_input = {
+        "name": name,
+        "workspaceSlug": workspace_slug,
+    }
 
-        create_variables = {"input": create_input}
+    if functional_type:
+        create_input["functionalType"] = functional_type.lower()
 
-        result = openhexa.execute(query=create_query, variables=create_variables)
-        response_data = result.json()
+    if tags:
+        create_input["tags"] = tags
 
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
+    create_variables = {"input": create_input}
 
-        create_result = response_data.get("data", {}).get("createPipeline", {})
+    result = openhexa.execute(query=create_query, variables=create_variables)
+    response_data = _parse(result)
 
-        if not create_result.get("success"):
-            errors = create_result.get("errors", [])
-            return {"error": f"Failed to create pipeline: {errors}"}
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
 
-        pipeline = create_result.get("pipeline")
-        if not pipeline:
-            return {"error": "Pipeline creation succeeded but no pipeline data returned"}
+    create_result = response_data["data"].get("createPipeline", {})
 
-        pipeline_code = pipeline["code"]
+    if not create_result.get("success"):
+        errors = create_result.get("errors", [])
+        return {"error": f"Failed to create pipeline: {errors}"}
 
-        # Step 2: Package code into ZIP (with optional requirements.txt and util files)
-        try:
-            zipfile_b64 = _create_pipeline_zipfile(code_content, requirements_txt, util_files)
-        except Exception as e:
-            return {
-                "error": f"Failed to create ZIP file: {str(e)}",
-                "pipeline": pipeline,
-                "note": "Pipeline was created but code upload failed",
-            }
+    pipeline = create_result.get("pipeline")
+    if not pipeline:
+        return {"error": "Pipeline creation succeeded but no pipeline data returned"}
 
-        # Step 3: Upload the code
-        upload_query = """
-            mutation uploadPipeline($input: UploadPipelineInput!) {
-                uploadPipeline(input: $input) {
-                    success
-                    errors
-                }
-            }
-        """
+    pipeline_code = pipeline["code"]
 
-        upload_input = {
-            "workspaceSlug": workspace_slug,
-            "pipelineCode": pipeline_code,
-            "name": "Initial version",
-            "description": description or "Created via MCP",
-            "zipfile": zipfile_b64,
+    # Step 2: Package code into ZIP (with optional requirements.txt and util files)
+    try:
+        zipfile_b64 = _create_pipeline_zipfile(code_content, requirements_txt, util_files)
+    except Exception as e:
+        return {
+            "error": f"Failed to create ZIP file: {str(e)}",
+            "pipeline": pipeline,
+            "note": "Pipeline was created but code upload failed",
         }
 
-        upload_variables = {"input": upload_input}
+    # Step 3: Upload the code
+    upload_query = _M_UPLOAD_INITIAL_VERSION
 
-        upload_result = openhexa.execute(query=upload_query, variables=upload_variables)
-        upload_response_data = upload_result.json()
+    upload_input = {
+        "workspaceSlug": workspace_slug,
+        "pipelineCode": pipeline_code,
+        "name": "Initial version",
+        "description": description or "Created via MCP",
+        "zipfile": zipfile_b64,
+    }
 
-        if "errors" in upload_response_data:
-            return {
-                "error": f"GraphQL error during upload: {upload_response_data['errors']}",
-                "pipeline": pipeline,
-                "note": "Pipeline was created but code upload failed",
-            }
-
-        upload_result_data = upload_response_data.get("data", {}).get("uploadPipeline", {})
+    upload_variables = {"input": upload_input}
 
-        if not upload_result_data.get("success"):
-            errors = upload_result_data.get("errors", [])
-            return {
-                "error": f"Failed to upload pipeline code: {errors}",
-                "pipeline": pipeline,
-                "note": "Pipeline was created but code upload failed",
-            }
+    upload_result = openhexa.execute(query=upload_query, variables=upload_variables)
+    upload_response_data = _parse(upload_result)
 
+    if "errors" in upload_response_data:
         return {
-            "success": True,
+            "error": f"GraphQL error during upload: {upload_response_data['errors']}",
             "pipeline": pipeline,
-            "message": f"Pipeline '{name}' created and code uploaded successfully",
+            "note": "Pipeline was created but code upload failed",
         }
 
-    except Exception as e:
-        return {"error": f"Failed to create pipeline: {str(e)}"}
+    upload_result_data = upload_response_data["data"].get("uploadPipeline", {})
 
+    if not upload_result_data.get("success"):
+        errors = upload_result_data.get("errors", [])
+        return {
+            "error": f"Failed to upload pipeline code: {errors}",
+            "pipeline": pipeline,
+            "note": "Pipeline was created but code upload failed",
+        }
 
-@mcp.tool
-def upload_pipeline_version(
-    workspace_slug: str,
-    pipeline_code: str,
-    code_content: str,
-    version_name: str | None = None,
-    description: str | None = None,
-    external_link: str | None = None,
-    requirements_txt: str | None = None,
-    util_files: dict[str, str] | None = None,
-) -> dict[str, Any]:
-    """
-    Upload a new version to an existing pipeline.
+    return {
+        "success": True,
+        "pipeline": pipeline,
+        "message": f"Pipeline '{name}' created and code uploaded successfully",
+    }
+
+
+_M_UPLOAD_PIPELINE_VERSION = """
+        mutation uploadPipeline($input: UploadPipelineInput!) {
+            uploadPipeline(input: $input) {
+                success
+                errors
+                details
+                pipelineVersion {
+                    id
+                    versionNumber
+                    versionName
+                    description
+                    createdAt
+                    pipeline {
+                        id
+                        name
+                        code
+                    }
+                }
+            }
+        }
+"""
+
+
+@mcp.tool
+@require_sdk
+def upload_pipeline_version(
+    workspace_slug: str,
+    pipeline_code: str,
+    code_content: str,
+    version_name: str | None = None,
+    description: str | None = None,
+    external_link: str | None = None,
+    requirements_txt: str | None = None,
+    util_files: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """
+    Upload a new version to an existing pipeline.
 
     This tool adds a new version to an already existing pipeline. Use create_pipeline
     to create a new pipeline first, then use this tool to update it with new versions.
@@ -574,171 +1055,186 @@ def upload_pipeline_version(
     Returns:
         Dict containing the uploaded pipeline version details
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
+    # Validate inputs
+    if not workspace_slug or not pipeline_code or not code_content:
+        return {"error": "workspace_slug, pipeline_code, and code_content are required"}
 
+    # Package code into ZIP (with optional requirements.txt and util files)
     try:
-        # Validate inputs
-        if not workspace_slug or not pipeline_code or not code_content:
-            return {"error": "workspace_slug, pipeline_code, and code_content are required"}
-
-        # Package code into ZIP (with optional requirements.txt and util files)
-        try:
-            zipfile_b64 = _create_pipeline_zipfile(code_content, requirements_txt, util_files)
-        except Exception as e:
-            return {"error": f"Failed to create ZIP file: {str(e)}"}
-
-        # Upload the new version
-        upload_query = """
-            mutation uploadPipeline($input: UploadPipelineInput!) {
-                uploadPipeline(input: $input) {
-                    success
-                    errors
-                    details
-                    pipelineVersion {
-                        id
-                        versionNumber
-                        versionName
-                        description
-                        createdAt
-                        pipeline {
-                            id
-                            name
-                            code
-                        }
-                    }
-                }
-            }
-        """
-
-        upload_input = {
-            "workspaceSlug": workspace_slug,
-            "pipelineCode": pipeline_code,
-            "zipfile": zipfile_b64,
-        }
-
-        if version_name:
-            upload_input["name"] = version_name
-        if description:
-            upload_input["description"] = description
-        if external_link:
-            upload_input["externalLink"] = external_link
-
-        upload_variables = {"input": upload_input}
-
-        result = openhexa.execute(query=upload_query, variables=upload_variables)
-        response_data = result.json()
-
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-
-        upload_result = response_data.get("data", {}).get("uploadPipeline", {})
-
-        if not upload_result.get("success"):
-            errors = upload_result.get("errors", [])
-            details = upload_result.get("details", "")
-            error_msg = f"Failed to upload pipeline version: {errors}"
-            if details:
-                error_msg += f" - {details}"
-
-            # Provide helpful error messages for common errors
-            if "PIPELINE_NOT_FOUND" in errors:
-                error_msg += (
-                    f"\nPipeline '{pipeline_code}' not found in workspace "
-                    f"'{workspace_slug}'. Use create_pipeline first."
-                )
-            elif "PERMISSION_DENIED" in errors:
-                error_msg += "\nYou don't have permission to update this pipeline."
-            elif "PIPELINE_DOES_NOT_SUPPORT_PARAMETERS" in errors:
-                error_msg += (
-                    "\nThis pipeline has a schedule and all parameters "
-                    "must be optional or have default values."
-                )
-            elif "DUPLICATE_PIPELINE_VERSION_NAME" in errors:
-                error_msg += (
-                    f"\nVersion name '{version_name}' already exists. Choose a different name."
-                )
-
-            return {"error": error_msg}
-
-        version = upload_result.get("pipelineVersion")
-        version_name_result = version.get("versionName") if version else "unknown"
-
-        return {
-            "success": True,
-            "version": version,
-            "message": (
-                f"New version '{version_name_result}' uploaded successfully "
-                f"to pipeline '{pipeline_code}'"
-            ),
-        }
-
+        zipfile_b64 = _create_pipeline_zipfile(code_content, requirements_txt, util_files)
     except Exception as e:
-        return {"error": "Failed to upload pipeline version: " + str(e)}
+        return {"error": f"Failed to create ZIP file: {str(e)}"}
+
+    # Upload the new version
+    upload_query = _M_UPLOAD_PIPELINE_VERSION
+
+    upload_input = {
+        "workspaceSlug": workspace_slug,
+        "pipelineCode": pipeline_code,
+        "zipfile": zipfile_b64,
+    }
+
+    if version_name:
+        upload_input["name"] = version_name
+    if description:
+        upload_input["description"] = description
+    if external_link:
+        upload_input["externalLink"] = external_link
+
+    upload_variables = {"input": upload_input}
+
+    result = openhexa.execute(query=upload_query, variables=upload_variables)
+    response_data = _parse(result)
+
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+
+    upload_result = response_data["data"].get("uploadPipeline", {})
+
+    if not upload_result.get("success"):
+        errors = upload_result.get("errors", [])
+        details = upload_result.get("details", "")
+        error_msg = f"Failed to upload pipeline version: {errors}"
+        if details:
+            error_msg += f" - {details}"
+
+        # Provide helpful error messages for common errors
+        if "PIPELINE_NOT_FOUND" in errors:
+            error_msg += (
+                f"\nPipeline '{pipeline_code}' not found in workspace "
+                f"'{workspace_slug}'. Use create_pipeline first."
+            )
+        elif "PERMISSION_DENIED" in errors:
+            error_msg += "\nYou don't have permission to update this pipeline."
+        elif "PIPELINE_DOES_NOT_SUPPORT_PARAMETERS" in errors:
+            error_msg += (
+                "\nThis pipeline has a schedule and all parameters "
+                "must be optional or have default values."
+            )
+        elif "DUPLICATE_PIPELINE_VERSION_NAME" in errors:
+            error_msg += (
+                f"\nVersion name '{version_name}' already exists. Choose a different name."
+            )
+
+        return {"error": error_msg}
+
+    version = upload_result.get("pipelineVersion")
+    version_name_result = version.get("versionName") if version else "unknown"
+
+    return {
+        "success": True,
+        "version": version,
+        "message": (
+            f"New version '{version_name_result}' uploaded successfully "
+            f"to pipeline '{pipeline_code}'"
+        ),
+    }
 
 
 @mcp.tool
-def list_connections(workspace_slug: str) -> dict[str, Any]:
+@require_sdk
+def list_connections(
+    workspace_slug: str, page: int = 1, per_page: int = 20, include_secrets: bool = False
+) -> dict[str, Any]:
     """
     List connections in a specific workspace.
 
     Args:
         workspace_slug: The workspace slug
+        page: Page number (default: 1)
+        per_page: Number of connections per page (default: 20)
+        include_secrets: Also fetch connection field values (default: False).
+                        Keep this off unless values are really needed - it
+                        shrinks the payload and keeps secrets out of context.
 
     Returns:
         Dict containing connection information
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
+    # The field values (which may hold secrets) are only selected on demand.
+    fields_selection = "code value secret" if include_secrets else "code secret"
+    query = f"""
+    query WorkspaceConnections($slug: String!) {{
+        workspace(slug: $slug) {{
+            connections {{
+                id
+                name
+                slug
+                description
+                type
+                createdAt
+                updatedAt
+                user {{
+                    id
+                    displayName
+                    email
+                }}
+                fields {{
+                    {fields_selection}
+                }}
+            }}
+        }}
+    }}
+    """
 
-    try:
-        query = """
-        query WorkspaceConnections($slug: String!) {
-            workspace(slug: $slug) {
-                connections {
+    variables = {"slug": workspace_slug}
+
+    response_data = _cached_execute(query, variables)
+
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+
+    workspace = response_data["data"].get("workspace")
+    if not workspace:
+        return {"error": f"Workspace '{workspace_slug}' not found"}
+
+    connections = workspace.get("connections", [])
+    # The connections field is a plain list in the schema; paginate here so
+    # the tool response stays bounded.
+    start = (page - 1) * per_page
+    page_items = connections[start : start + per_page]
+
+    return {
+        "connections": page_items,
+        "count": len(page_items),
+        "total_items": len(connections),
+        "current_page": page,
+        "per_page": per_page,
+    }
+
+
+_Q_WORKSPACE_WEBAPPS = """
+    query WorkspaceWebapps($slug: String!, $page: Int = 1, $perPage: Int = 10) {
+        workspace(slug: $slug) {
+            webapps(page: $page, perPage: $perPage) {
+                items {
                     id
                     name
-                    slug
                     description
-                    type
+                    url
+                    icon
+                    isFavorite
                     createdAt
-                    updatedAt
-                    user {
+                    createdBy {
                         id
                         displayName
                         email
                     }
-                    fields {
-                        code
-                        value
-                        secret
+                    permissions {
+                        delete
+                        update
                     }
                 }
+                pageNumber
+                totalItems
+                totalPages
             }
         }
-        """
-
-        variables = {"slug": workspace_slug}
-
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
-
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-
-        workspace = response_data.get("data", {}).get("workspace")
-        if not workspace:
-            return {"error": f"Workspace '{workspace_slug}' not found"}
-
-        connections = workspace.get("connections", [])
-
-        return {"connections": connections, "count": len(connections)}
-
-    except Exception as e:
-        return {"error": f"Failed to list connections: {str(e)}"}
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def list_webapps(workspace_slug: str, page: int = 1, per_page: int = 10) -> dict[str, Any]:
     """
     List webapps in a specific workspace.
@@ -751,67 +1247,90 @@ def list_webapps(workspace_slug: str, page: int = 1, per_page: int = 10) -> dict
     Returns:
         Dict containing webapp information
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
+    query = _Q_WORKSPACE_WEBAPPS
 
-    try:
-        query = """
-        query WorkspaceWebapps($slug: String!, $page: Int = 1, $perPage: Int = 10) {
-            workspace(slug: $slug) {
-                webapps(page: $page, perPage: $perPage) {
-                    items {
-                        id
-                        name
-                        description
-                        url
-                        icon
-                        isFavorite
-                        createdAt
-                        createdBy {
-                            id
-                            displayName
-                            email
-                        }
-                        permissions {
-                            delete
-                            update
-                        }
-                    }
-                    pageNumber
-                    totalItems
-                    totalPages
-                }
-            }
-        }
-        """
+    variables = {"slug": workspace_slug, "page": page, "perPage": per_page}
 
-        variables = {"slug": workspace_slug, "page": page, "perPage": per_page}
+    response_data = _cached_execute(query, variables)
 
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
 
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
+    workspace = response_data["data"].get("workspace")
+    if not workspace:
+        return {"error": f"Workspace '{workspace_slug}' not found"}
 
-        workspace = response_data.get("data", {}).get("workspace")
-        if not workspace:
-            return {"error": f"Workspace '{workspace_slug}' not found"}
+    webapps_data = workspace.get("webapps", {})
 
-        webapps_data = workspace.get("webapps", {})
+    return {
+        "webapps": webapps_data.get("items", []),
+        "total_pages": webapps_data.get("totalPages", 0),
+        "total_items": webapps_data.get("totalItems", 0),
+        "current_page": webapps_data.get("pageNumber", page),
+    }
 
-        return {
-            "webapps": webapps_data.get("items", []),
-            "total_pages": webapps_data.get("totalPages", 0),
-            "total_items": webapps_data.get("totalItems", 0),
-            "current_page": webapps_data.get("pageNumber", page),
+
+# Server-side search queries used by search_resources: matching happens in the
+# backend, so we never download pages of resources only to discard them.
+_SEARCH_WORKSPACES_QUERY = """
+query searchWorkspaces($query: String, $page: Int!, $perPage: Int!) {
+    workspaces(query: $query, page: $page, perPage: $perPage) {
+        items {
+            slug
+            name
+            description
         }
+        totalItems
+    }
+}
+"""
 
-    except Exception as e:
-        return {"error": f"Failed to list webapps: {str(e)}"}
+_SEARCH_DATASETS_QUERY = """
+query searchDatasets($query: String, $page: Int!, $perPage: Int!) {
+    datasets(query: $query, page: $page, perPage: $perPage) {
+        items {
+            id
+            name
+            slug
+            description
+            workspace {
+                slug
+            }
+        }
+        totalItems
+    }
+}
+"""
+
+_SEARCH_PIPELINES_QUERY = """
+query searchPipelines($query: String, $workspaceSlug: String, $page: Int!, $perPage: Int!) {
+    pipelines(search: $query, workspaceSlug: $workspaceSlug, page: $page, perPage: $perPage) {
+        items {
+            id
+            name
+            code
+            description
+            workspace {
+                slug
+            }
+        }
+        totalItems
+    }
+}
+"""
+
+# Dispatch table for search_resources: resource type -> (query document,
+# response field, whether the query takes a workspaceSlug variable).
+_SEARCHERS = {
+    "workspace": (_SEARCH_WORKSPACES_QUERY, "workspaces", False),
+    "dataset": (_SEARCH_DATASETS_QUERY, "datasets", False),
+    "pipeline": (_SEARCH_PIPELINES_QUERY, "pipelines", True),
+}
 
 
 @mcp.tool
-def search_resources(
+@require_sdk
+async def search_resources(
     query: str, resource_type: str | None = None, workspace_slug: str | None = None
 ) -> dict[str, Any]:
     """
@@ -825,54 +1344,69 @@ def search_resources(
     Returns:
         Dict containing search results
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-
-    try:
-        results = {"success": True, "query": query, "results": []}
-
-        # Search workspaces
-        if not resource_type or resource_type == "workspace":
-            workspace_results = list_workspaces()
-            if workspace_results.get("success"):
-                for workspace in workspace_results.get("workspaces", []):
-                    if (
-                        query.lower() in workspace.get("name", "").lower()
-                        or query.lower() in workspace.get("description", "").lower()
-                    ):
-                        results["results"].append({"type": "workspace", "resource": workspace})
-
-        # Search datasets
-        if not resource_type or resource_type == "dataset":
-            dataset_results = list_datasets(workspace_slug=workspace_slug)
-            if dataset_results.get("success"):
-                for dataset in dataset_results.get("datasets", []):
-                    dataset_obj = dataset.get("dataset", dataset)  # Handle nested structure
-                    if (
-                        query.lower() in dataset_obj.get("name", "").lower()
-                        or query.lower() in dataset_obj.get("description", "").lower()
-                    ):
-                        results["results"].append({"type": "dataset", "resource": dataset_obj})
-
-        # Search pipelines
-        if not resource_type or resource_type == "pipeline":
-            pipeline_results = list_pipelines(workspace_slug=workspace_slug)
-            if pipeline_results.get("success"):
-                for pipeline in pipeline_results.get("pipelines", []):
-                    if (
-                        query.lower() in pipeline.get("name", "").lower()
-                        or query.lower() in pipeline.get("description", "").lower()
-                    ):
-                        results["results"].append({"type": "pipeline", "resource": pipeline})
-
-        results["count"] = len(results["results"])
-        return results
-
-    except Exception as e:
-        return {"error": f"Failed to search resources: {str(e)}"}
+    if resource_type is None:
+        targets = _SEARCHERS
+    elif resource_type in _SEARCHERS:
+        targets = {resource_type: _SEARCHERS[resource_type]}
+    else:
+        return {"error": f"Unknown resource type '{resource_type}'. Valid types: {sorted(_SEARCHERS)}"}
+
+    # The search endpoints are independent round-trips: fan them out
+    # together so total latency is the slowest call, not the sum.
+    pending = {}
+    for kind, (search_query, _, scoped) in targets.items():
+        variables = {"query": query, "page": 1, "perPage": 20}
+        if scoped:
+            variables["workspaceSlug"] = workspace_slug
+        pending[kind] = asyncio.to_thread(_cached_execute, search_query, variables)
+    fetched = dict(zip(pending.keys(), await asyncio.gather(*pending.values())))
+
+    # Accumulate into a dict keyed by (type, identifier) so a resource that
+    # matches several searchers (or overlapping pages) appears once, in
+    # insertion order.
+    seen: dict[tuple, dict] = {}
+    for kind, (_, field, _scoped) in targets.items():
+        response_data = fetched.get(kind)
+        if not response_data or "errors" in response_data:
+            continue
+        for item in response_data["data"].get(field, {}).get("items", []):
+            # The datasets query has no workspace argument; scope client-side.
+            if (
+                kind == "dataset"
+                and workspace_slug
+                and (item.get("workspace") or {}).get("slug") != workspace_slug
+            ):
+                continue
+            key = (kind, item.get("id") or item.get("slug"))
+            seen.setdefault(key, {"type": kind, "resource": item})
+
+    matches = list(seen.values())
+    return {"success": True, "query": query, "results": matches, "count": len(matches)}
+
+
+_Q_DATASET_VERSIONS = """
+    query getDataset($id: ID!) {
+        dataset(id: $id) {
+            versions {
+                items {
+                    id
+                    name
+                    changelog
+                    createdAt
+                    createdBy {
+                        id
+                        displayName
+                        email
+                    }
+                }
+            }
+        }
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def list_dataset_versions(dataset_id: str) -> dict[str, Any]:
     """
     List all versions of a dataset.
@@ -881,42 +1415,43 @@ def list_dataset_versions(dataset_id: str) -> dict[str, Any]:
     Returns:
         Dict containing dataset version information
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-    try:
-        query = """
-        query getDataset($id: ID!) {
-            dataset(id: $id) {
-                versions {
-                    items {
-                        id
-                        name
-                        changelog
-                        createdAt
-                        createdBy {
-                            id
-                            displayName
-                            email
-                        }
-                    }
+    query = _Q_DATASET_VERSIONS
+    response_data = _cached_execute(query, {"id": dataset_id})
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+    dataset = response_data["data"].get("dataset")
+    if not dataset:
+        return {"error": f"Dataset '{dataset_id}' not found"}
+    versions = dataset.get("versions", {}).get("items", [])
+    return {"versions": versions, "count": len(versions)}
+
+
+_Q_DATASET_VERSION_DETAILS = """
+    query getDatasetVersion($id: ID!) {
+        datasetVersion(id: $id) {
+            id
+            name
+            changelog
+            createdAt
+            createdBy {
+                id
+                displayName
+                email
+            }
+            files {
+                items {
+                    id
+                    size
+                    createdAt
                 }
             }
         }
-        """
-        result = openhexa.execute(query=query, variables={"id": dataset_id})
-        response_data = result.json()
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-        dataset = response_data.get("data", {}).get("dataset")
-        if not dataset:
-            return {"error": f"Dataset '{dataset_id}' not found"}
-        versions = dataset.get("versions", {}).get("items", [])
-        return {"versions": versions, "count": len(versions)}
-    except Exception as e:
-        return {"error": f"Failed to list dataset versions: {str(e)}"}
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def get_dataset_version_details(version_id: str) -> dict[str, Any]:
     """
     Get detailed information about a specific dataset version.
@@ -925,91 +1460,187 @@ def get_dataset_version_details(version_id: str) -> dict[str, Any]:
     Returns:
         Dict containing detailed dataset version information
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-    try:
-        query = """
-        query getDatasetVersion($id: ID!) {
-            datasetVersion(id: $id) {
-                id
-                name
-                changelog
-                createdAt
-                createdBy {
+    query = _Q_DATASET_VERSION_DETAILS
+    response_data = _cached_execute(query, {"id": version_id})
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+    version = response_data["data"].get("datasetVersion")
+    if not version:
+        return {"error": f"Dataset version '{version_id}' not found"}
+    return {"version": version}
+
+
+_Q_DATASET_FILES = """
+    query getDataset($id: ID!, $page: Int!, $perPage: Int!) {
+        dataset(id: $id) {
+            versions(page: $page, perPage: $perPage) {
+                totalItems
+                totalPages
+                items {
                     id
-                    displayName
-                    email
-                }
-                files {
-                    items {
-                        id
-                        size
-                        createdAt
+                    name
+                    files {
+                        items {
+                            id
+                            size
+                            createdAt
+                        }
                     }
                 }
             }
         }
-        """
-        result = openhexa.execute(query=query, variables={"id": version_id})
-        response_data = result.json()
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-        version = response_data.get("data", {}).get("datasetVersion")
-        if not version:
-            return {"error": f"Dataset version '{version_id}' not found"}
-        return {"version": version}
-    except Exception as e:
-        return {"error": f"Failed to get dataset version details: {str(e)}"}
+    }
+"""
+
+
+# Versions fetched per round-trip while walking a dataset's files.
+_VERSION_PAGE_SIZE = 10
 
 
 @mcp.tool
-def list_dataset_files(dataset_id: str) -> dict[str, Any]:
+@require_sdk
+def list_dataset_files(
+    dataset_id: str, cursor: str | None = None, max_files: int = 200
+) -> dict[str, Any]:
     """
-    List all files for all versions of a dataset.
+    List files of a dataset incrementally.
+
+    Instead of flattening every version's files into one giant response,
+    this returns at most max_files entries per call plus an opaque cursor;
+    pass the cursor back to resume where the previous call stopped.
+
     Args:
         dataset_id: The ID identifier for the dataset
+        cursor: Opaque resume cursor from a previous call (default: start)
+        max_files: Maximum number of files to return per call (default: 200)
     Returns:
-        Dict containing all files for all versions
+        Dict with the files, a count and next_cursor (None when exhausted)
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-    try:
-        query = """
-        query getDataset($id: ID!) {
-            dataset(id: $id) {
-                versions {
-                    items {
-                        id
-                        name
-                        files {
-                            items {
-                                id
-                                size
-                                createdAt
-                            }
+    if cursor:
+        try:
+            page, version_index, file_index = (int(part) for part in cursor.split(":"))
+        except ValueError:
+            return {"error": f"Invalid cursor '{cursor}'"}
+    else:
+        page, version_index, file_index = 1, 0, 0
+
+    files: list[dict] = []
+    next_cursor = None
+    while next_cursor is None:
+        response_data = _cached_execute(
+            _Q_DATASET_FILES,
+            {"id": dataset_id, "page": page, "perPage": _VERSION_PAGE_SIZE},
+        )
+        if "errors" in response_data:
+            return {"error": f"GraphQL error: {response_data['errors']}", "raw": response_data}
+        dataset = response_data["data"].get("dataset")
+        if not dataset:
+            return {"error": f"Dataset '{dataset_id}' not found"}
+        versions_info = dataset.get("versions", {})
+        versions = versions_info.get("items", [])
+        for vi in range(version_index, len(versions)):
+            version = versions[vi]
+            version_files = version.get("files", {}).get("items", [])
+            for fi in range(file_index, len(version_files)):
+                if len(files) >= max_files:
+                    next_cursor = f"{page}:{vi}:{fi}"
+                    break
+                files.append(
+                    {
+                        **version_files[fi],
+                        "version_id": version["id"],
+                        "version_name": version["name"],
+                    }
+                )
+            if next_cursor is not None:
+                break
+            file_index = 0
+        if next_cursor is not None:
+            break
+        if not versions or page >= versions_info.get("totalPages", 0):
+            break
+        page += 1
+        version_index = 0
+
+    return {"files": files, "count": len(files), "next_cursor": next_cursor}
+
+
+@mcp.tool
+@require_sdk
+def list_dataset_files_bulk(dataset_ids: list[str]) -> dict[str, Any]:
+    """
+    List files for several datasets in a single GraphQL request.
+    Args:
+        dataset_ids: The ID identifiers of the datasets
+    Returns:
+        Dict mapping each dataset ID to its flattened file list
+    """
+    if not dataset_ids:
+        return {"datasets": {}, "count": 0}
+    selection = """
+            versions {
+                items {
+                    id
+                    name
+                    files {
+                        items {
+                            id
+                            size
+                            createdAt
                         }
                     }
                 }
             }
-        }
-        """
-        result = openhexa.execute(query=query, variables={"id": dataset_id})
-        response_data = result.json()
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}", "raw": response_data}
-        dataset = response_data.get("data", {}).get("dataset")
+    """
+    # IDs travel as variables, never interpolated into the document: a quote
+    # in an ID would otherwise corrupt (or inject into) the query.
+    args = ", ".join(f"$id{index}: ID!" for index in range(len(dataset_ids)))
+    aliases = "\n".join(
+        f"d{index}: dataset(id: $id{index}) {{ id {selection} }}"
+        for index in range(len(dataset_ids))
+    )
+    query = f"query getDatasets({args}) {{\n{aliases}\n}}"
+    variables = {f"id{index}": dataset_id for index, dataset_id in enumerate(dataset_ids)}
+    response_data = _cached_execute(query, variables)
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}", "raw": response_data}
+    datasets = {}
+    for index, dataset_id in enumerate(dataset_ids):
+        dataset = response_data["data"].get(f"d{index}")
         if not dataset:
-            return {"error": f"Dataset '{dataset_id}' not found"}
-        files = []
-        for version in dataset.get("versions", {}).get("items", []):
-            for file in version.get("files", {}).get("items", []):
-                files.append({**file, "version_id": version["id"], "version_name": version["name"]})
-        return {"files": files, "count": len(files)}
-    except Exception as e:
-        return {"error": f"Failed to list dataset files: {str(e)}"}
+            datasets[dataset_id] = {"error": f"Dataset '{dataset_id}' not found"}
+            continue
+        files = [
+            {**file, "version_id": version["id"], "version_name": version["name"]}
+            for version in dataset.get("versions", {}).get("items", [])
+            for file in version.get("files", {}).get("items", [])
+        ]
+        datasets[dataset_id] = {"files": files, "count": len(files)}
+    return {"datasets": datasets, "count": len(datasets)}
+
+
+_Q_DATASET_FILE_DETAILS = """
+    query getFile($id: ID!) {
+        datasetVersionFile(id: $id) {
+            id
+            filename
+            size
+            contentType
+            createdAt
+            createdBy {
+                id
+                displayName
+                email
+            }
+            downloadUrl
+            uri
+        }
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def get_dataset_file_details(file_id: str) -> dict[str, Any]:
     """
     Get details for a specific dataset file.
@@ -1018,41 +1649,42 @@ def get_dataset_file_details(file_id: str) -> dict[str, Any]:
     Returns:
         Dict containing file metadata
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-    try:
-        query = """
-        query getFile($id: ID!) {
-            datasetVersionFile(id: $id) {
+    query = _Q_DATASET_FILE_DETAILS
+    variables = {"id": file_id}
+    response_data = _cached_execute(query, variables)
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+    file = response_data["data"].get("datasetVersionFile")
+    if not file:
+        return {"error": f"File '{file_id}' not found"}
+    return {"file": file}
+
+
+_Q_SEARCH_DATASETS = """
+    query searchDatasets($query: String, $page: Int!, $perPage: Int!) {
+        datasets(query: $query, page: $page, perPage: $perPage) {
+            items {
                 id
-                filename
-                size
-                contentType
+                name
+                slug
+                description
                 createdAt
+                updatedAt
                 createdBy {
                     id
                     displayName
                     email
                 }
-                downloadUrl
-                uri
             }
+            totalItems
+            totalPages
         }
-        """
-        variables = {"id": file_id}
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-        file = response_data.get("data", {}).get("datasetVersionFile")
-        if not file:
-            return {"error": f"File '{file_id}' not found"}
-        return {"file": file}
-    except Exception as e:
-        return {"error": f"Failed to get file details: {str(e)}"}
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def search_datasets(query_str: str, page: int = 1, per_page: int = 20) -> dict[str, Any]:
     """
     Search datasets by name or description.
@@ -1071,52 +1703,50 @@ def search_datasets(query_str: str, page: int = 1, per_page: int = 20) -> dict[s
         - count: Number of items in current page
         - total_items: Total number of items across all pages
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-    try:
-        query = """
-        query searchDatasets($query: String, $page: Int!, $perPage: Int!) {
-            datasets(query: $query, page: $page, perPage: $perPage) {
-                items {
+    query = _Q_SEARCH_DATASETS
+    variables = {"query": query_str, "page": page, "perPage": per_page}
+    response_data = _cached_execute(query, variables)
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+    datasets_info = response_data["data"].get("datasets", {})
+    datasets = datasets_info.get("items", [])
+    total_items = datasets_info.get("totalItems", 0)
+    total_pages = datasets_info.get("totalPages", 0)
+    return {
+        "datasets": datasets,
+        "count": len(datasets),
+        "total_items": total_items,
+        "total_pages": total_pages,
+        "current_page": page,
+        "per_page": per_page,
+    }
+
+
+_Q_DATASETS_BY_CREATOR = """
+    query datasetsByCreator($page: Int!, $perPage: Int!) {
+        datasets(page: $page, perPage: $perPage) {
+            items {
+                id
+                name
+                slug
+                description
+                createdAt
+                updatedAt
+                createdBy {
                     id
-                    name
-                    slug
-                    description
-                    createdAt
-                    updatedAt
-                    createdBy {
-                        id
-                        displayName
-                        email
-                    }
+                    displayName
+                    email
                 }
-                totalItems
-                totalPages
             }
+            totalItems
+            totalPages
         }
-        """
-        variables = {"query": query_str, "page": page, "perPage": per_page}
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-        datasets_info = response_data.get("data", {}).get("datasets", {})
-        datasets = datasets_info.get("items", [])
-        total_items = datasets_info.get("totalItems", 0)
-        total_pages = datasets_info.get("totalPages", 0)
-        return {
-            "datasets": datasets,
-            "count": len(datasets),
-            "total_items": total_items,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page,
-        }
-    except Exception as e:
-        return {"error": f"Failed to search datasets: {str(e)}"}
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def list_datasets_by_creator(
     creator_email: str, page: int = 1, per_page: int = 20
 ) -> dict[str, Any]:
@@ -1129,92 +1759,257 @@ def list_datasets_by_creator(
     Returns:
         Dict containing datasets by creator
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
-    try:
-        query = """
-        query datasetsByCreator($page: Int!, $perPage: Int!) {
-            datasets(page: $page, perPage: $perPage) {
-                items {
-                    id
-                    name
-                    slug
-                    description
-                    createdAt
-                    updatedAt
-                    createdBy {
-                        id
-                        displayName
-                        email
-                    }
-                }
-                totalItems
-                totalPages
-            }
+
+    # The datasets query has no creator argument, so filter client-side —
+    # but walk every server page so "page 1" means page 1 of matches, not
+    # whatever matches happened to land on server page 1.
+    def matches():
+        server_page = 1
+        while True:
+            response_data = _cached_execute(
+                _Q_DATASETS_BY_CREATOR, {"page": server_page, "perPage": 50}
+            )
+            if "errors" in response_data:
+                raise RuntimeError(f"GraphQL error: {response_data['errors']}")
+            datasets_info = response_data["data"].get("datasets", {})
+            items = datasets_info.get("items", [])
+            for dataset in items:
+                if (dataset.get("createdBy") or {}).get("email") == creator_email:
+                    yield dataset
+            if not items or server_page >= datasets_info.get("totalPages", 0):
+                return
+            server_page += 1
+
+    start = (page - 1) * per_page
+    datasets = list(itertools.islice(matches(), start, start + per_page))
+    return {
+        "datasets": datasets,
+        "count": len(datasets),
+        "current_page": page,
+        "per_page": per_page,
+    }
+
+
+_Q_DATASET_FILE_SAMPLE = """
+    query GetDatasetVersionFileSample($id: ID!) {
+      datasetVersionFile(id: $id) {
+        id
+        properties
+        fileSample {
+          sample
+          status
+          statusReason
+          __typename
         }
-        """
-        variables = {"page": page, "perPage": per_page}
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-        datasets = response_data.get("data", {}).get("datasets", {}).get("items", [])
-        filtered = [d for d in datasets if d.get("createdBy", {}).get("email") == creator_email]
+        __typename
+      }
+    }
+"""
+
+
+def _export_leaf(value):
+    """Copy a simdjson container view into plain Python; scalars pass through.
+
+    Views must not outlive the shared parser's next parse, so containers are
+    materialized before the result escapes.
+    """
+    if simdjson is not None:
+        if isinstance(value, simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, simdjson.Array):
+            return value.as_list()
+    return value
+
+
+# Pre-built messages for the preview path: constants instead of per-call
+# f-string formatting, and no repr() of the structured GraphQL error list —
+# it is returned as data under "errors" and serialized once at the boundary.
+_ERR_GRAPHQL = "GraphQL error"
+_ERR_PREVIEW_TRANSPORT = "File preview request failed"
+_ERR_PREVIEW_DECODE = "Failed to decode file preview response"
+
+
+class _SampleResult:
+    """One file's preview fields as a fixed slotted record.
+
+    Slot stores keep field assembly cheap, but records never leave a tool:
+    FastMCP's structured-output path bypasses the custom tool serializer,
+    so results are materialized via _as_dict before returning.
+    """
+
+    __slots__ = ("file_id", "sample", "status", "status_reason", "properties")
+
+    def __init__(self, file_id: str, file_data: dict):
+        sample_info = file_data.get("fileSample")
+        self.file_id = file_id
+        if sample_info:
+            self.sample = sample_info.get("sample")
+            self.status = sample_info.get("status")
+            self.status_reason = sample_info.get("statusReason")
+        else:
+            self.sample = self.status = self.status_reason = None
+        self.properties = file_data.get("properties")
+
+    def _as_dict(self) -> dict:
         return {
-            "datasets": filtered,
-            "count": len(filtered),
-            "current_page": page,
-            "per_page": per_page,
+            "file_id": self.file_id,
+            "sample": self.sample,
+            "status": self.status,
+            "status_reason": self.status_reason,
+            "properties": self.properties,
         }
-    except Exception as e:
-        return {"error": f"Failed to list datasets by creator: {str(e)}"}
+
+
+def _preview_entry(file_id: str, file_data: dict) -> dict:
+    """Shape one datasetVersionFile node into the preview payload."""
+    return _SampleResult(file_id, file_data)._as_dict()
+
+
+def _preview_from_dict(file_id: str, response_data: dict) -> dict:
+    """Build a preview payload from a fully materialized response dict."""
+    if "errors" in response_data:
+        return {"error": _ERR_GRAPHQL, "errors": response_data["errors"], "raw": response_data}
+    file_data = response_data["data"].get("datasetVersionFile")
+    if not file_data:
+        return {"error": f"File '{file_id}' not found"}
+    return _preview_entry(file_id, file_data)
+
+
+class _PreviewError(Exception):
+    """Carries a preview error payload out of the cached fetch.
+
+    Raising instead of returning keeps failures out of the LRU cache so a
+    transient error can be retried.
+    """
+
+    def __init__(self, payload: dict):
+        super().__init__(payload.get("error", "preview failed"))
+        self.payload = payload
+
+
+@functools.lru_cache(maxsize=1024)
+def _fetch_sample(file_id: str) -> dict:
+    """Fetch one file's sample; results are immutable so they cache forever."""
+    try:
+        raw = _execute_raw(_Q_DATASET_FILE_SAMPLE, {"id": file_id})
+    except _TRANSPORT_ERRORS as e:
+        raise _PreviewError({"error": _ERR_PREVIEW_TRANSPORT, "detail": str(e)})
+    try:
+        if _simdjson_parser is None or isinstance(raw, dict):
+            payload = _preview_from_dict(file_id, raw if isinstance(raw, dict) else _loads(raw))
+            if "error" in payload:
+                raise _PreviewError(payload)
+            return payload
+
+        # Bytes-level prefilter: most responses carry no errors, so a substring
+        # scan decides the branch without parsing anything. A false positive
+        # (the text appearing inside the sample itself) just means that response
+        # takes the full-parse path, which handles error-free payloads fine.
+        if b'"errors"' in raw:
+            payload = _preview_from_dict(file_id, _loads(raw))
+            if "error" in payload:
+                raise _PreviewError(payload)
+            return payload
+
+        # Lazy path: pull just the leaves we return out of the payload instead
+        # of materializing the whole response. The lock is held from parse
+        # through leaf extraction: the shared parser is not thread-safe and a
+        # concurrent parse would invalidate this document mid-read.
+        with _SIMDJSON_LOCK:
+            doc = _simdjson_parser.parse(raw)
+            try:
+                file_node = doc.at_pointer("/data/datasetVersionFile")
+            except KeyError:
+                file_node = None
+            if not file_node:
+                raise _PreviewError({"error": f"File '{file_id}' not found"})
+
+            preview = {"file_id": file_id, "sample": None, "status": None, "status_reason": None}
+            for key, pointer in (
+                ("sample", "/data/datasetVersionFile/fileSample/sample"),
+                ("status", "/data/datasetVersionFile/fileSample/status"),
+                ("status_reason", "/data/datasetVersionFile/fileSample/statusReason"),
+            ):
+                try:
+                    preview[key] = _export_leaf(doc.at_pointer(pointer))
+                except KeyError:
+                    pass
+            try:
+                preview["properties"] = _export_leaf(
+                    doc.at_pointer("/data/datasetVersionFile/properties")
+                )
+            except KeyError:
+                preview["properties"] = None
+            return preview
+    except ValueError as e:
+        # Covers orjson/json/simdjson decode errors on a malformed body.
+        raise _PreviewError({"error": _ERR_PREVIEW_DECODE, "detail": str(e)})
 
 
 @mcp.tool
+@require_sdk
 def preview_dataset_file(file_id: str) -> dict:
     """
     Preview a dataset file by fetching a sample using the OpenHEXA GraphQL API.
+
+    Samples are immutable for a given file ID (dataset versions are frozen),
+    so successful previews are served from an in-process LRU cache.
+
     Args:
         file_id: The ID of the file to preview
     Returns:
         Dict containing the file sample, status, and any status reason
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure your OpenHEXA credentials."}
     try:
-        query = """
-        query GetDatasetVersionFileSample($id: ID!) {
-          datasetVersionFile(id: $id) {
-            id
-            properties
-            fileSample {
-              sample
-              status
-              statusReason
-              __typename
-            }
-            __typename
-          }
-        }
-        """
-        variables = {"id": file_id}
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
+        return _fetch_sample(file_id)
+    except _PreviewError as e:
+        return e.payload
+
+
+# Files previewed per GraphQL request in the batched tool; larger lists are
+# split so no single request body or response grows unbounded.
+_PREVIEW_BATCH_SIZE = 25
+
+
+@mcp.tool
+@require_sdk
+def preview_dataset_files(file_ids: list[str]) -> dict:
+    """
+    Preview several dataset files, batching them into aliased GraphQL requests.
+
+    N previews cost ceil(N / 25) round-trips instead of N separate calls to
+    preview_dataset_file.
+
+    Args:
+        file_ids: The IDs of the files to preview
+    Returns:
+        Dict mapping each file ID to its preview payload
+    """
+    if not file_ids:
+        return {"files": {}, "count": 0}
+    previews = {}
+    for start in range(0, len(file_ids), _PREVIEW_BATCH_SIZE):
+        batch = file_ids[start : start + _PREVIEW_BATCH_SIZE]
+        args = ", ".join(f"$id{i}: ID!" for i in range(len(batch)))
+        selections = "\n".join(
+            f"f{i}: datasetVersionFile(id: $id{i}) "
+            "{ id properties fileSample { sample status statusReason } }"
+            for i in range(len(batch))
+        )
+        query = f"query previewFiles({args}) {{\n{selections}\n}}"
+        variables = {f"id{i}": file_id for i, file_id in enumerate(batch)}
+        raw = _execute_raw(query, variables)
+        response_data = raw if isinstance(raw, dict) else _loads(raw)
         if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}", "raw": response_data}
-        file_data = response_data.get("data", {}).get("datasetVersionFile")
-        if not file_data:
-            return {"error": f"File '{file_id}' not found"}
-        sample_info = file_data.get("fileSample")
-        return {
-            "file_id": file_id,
-            "sample": sample_info.get("sample") if sample_info else None,
-            "status": sample_info.get("status") if sample_info else None,
-            "status_reason": sample_info.get("statusReason") if sample_info else None,
-            "properties": file_data.get("properties"),
-        }
-    except Exception as e:
-        return {"error": f"Failed to preview file: {str(e)}"}
+            return {"error": _ERR_GRAPHQL, "errors": response_data["errors"], "raw": response_data}
+        data = response_data["data"]
+        for i, file_id in enumerate(batch):
+            file_data = data.get(f"f{i}")
+            if not file_data:
+                previews[file_id] = {"error": f"File '{file_id}' not found"}
+                continue
+            previews[file_id] = _preview_entry(file_id, file_data)
+    return {"files": previews, "count": len(previews)}
 
 
 # =============================================================================
@@ -1222,7 +2017,63 @@ def preview_dataset_file(file_id: str) -> dict:
 # =============================================================================
 
 
+_Q_PIPELINE_TEMPLATES = """
+    query listPipelineTemplates(
+        $page: Int,
+        $perPage: Int,
+        $search: String,
+        $functionalType: PipelineFunctionalType,
+        $isValidated: Boolean,
+        $tags: [String!],
+        $orderBy: PipelineTemplateOrderBy
+    ) {
+        pipelineTemplates(
+            page: $page,
+            perPage: $perPage,
+            search: $search,
+            functionalType: $functionalType,
+            isValidated: $isValidated,
+            tags: $tags,
+            orderBy: $orderBy
+        ) {
+            pageNumber
+            totalPages
+            totalItems
+            items {
+                id
+                name
+                code
+                description
+                functionalType
+                pipelinesCount
+                validatedAt
+                updatedAt
+                tags {
+                    id
+                    name
+                }
+                organization {
+                    id
+                    name
+                }
+                currentVersion {
+                    id
+                    versionNumber
+                    changelog
+                    createdAt
+                }
+                permissions {
+                    delete
+                    update
+                }
+            }
+        }
+    }
+"""
+
+
 @mcp.tool
+@require_sdk
 def list_pipeline_templates(
     page: int = 1,
     per_page: int = 15,
@@ -1263,102 +2114,101 @@ def list_pipeline_templates(
     Returns:
         Dict containing templates and pagination information
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure credentials."}
-
-    try:
-        query = """
-        query listPipelineTemplates(
-            $page: Int,
-            $perPage: Int,
-            $search: String,
-            $functionalType: PipelineFunctionalType,
-            $isValidated: Boolean,
-            $tags: [String!],
-            $orderBy: PipelineTemplateOrderBy
-        ) {
-            pipelineTemplates(
-                page: $page,
-                perPage: $perPage,
-                search: $search,
-                functionalType: $functionalType,
-                isValidated: $isValidated,
-                tags: $tags,
-                orderBy: $orderBy
-            ) {
-                pageNumber
-                totalPages
+    query = _Q_PIPELINE_TEMPLATES
+
+    variables: dict[str, Any] = {
+        "page": page,
+        "perPage": per_page,
+    }
+
+    if search:
+        variables["search"] = search
+    if functional_type:
+        variables["functionalType"] = functional_type.upper()
+    if is_validated is not None:
+        variables["isValidated"] = is_validated
+    if tags:
+        variables["tags"] = tags
+    if order_by:
+        variables["orderBy"] = order_by
+
+    response_data = _cached_execute(query, variables)
+
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+
+    templates_data = response_data["data"].get("pipelineTemplates", {})
+
+    return {
+        "templates": templates_data.get("items", []),
+        "total_pages": templates_data.get("totalPages", 0),
+        "total_items": templates_data.get("totalItems", 0),
+        "current_page": templates_data.get("pageNumber", page),
+        "per_page": per_page,
+        "count": len(templates_data.get("items", [])),
+    }
+
+
+_Q_TEMPLATE_BY_CODE = """
+    query getTemplateByCode($code: String!) {
+        templateByCode(code: $code) {
+            id
+            name
+            code
+            description
+            config
+            functionalType
+            pipelinesCount
+            validatedAt
+            updatedAt
+            tags {
+                id
+                name
+            }
+            organization {
+                id
+                name
+            }
+            workspace {
+                slug
+                name
+            }
+            currentVersion {
+                id
+                versionNumber
+                changelog
+                createdAt
+                isLatestVersion
+                user {
+                    id
+                    displayName
+                    email
+                }
+                sourcePipelineVersion {
+                    id
+                    versionName
+                }
+            }
+            versions(page: 1, perPage: 10) {
                 totalItems
                 items {
                     id
-                    name
-                    code
-                    description
-                    functionalType
-                    pipelinesCount
-                    validatedAt
-                    updatedAt
-                    tags {
-                        id
-                        name
-                    }
-                    organization {
-                        id
-                        name
-                    }
-                    currentVersion {
-                        id
-                        versionNumber
-                        changelog
-                        createdAt
-                    }
-                    permissions {
-                        delete
-                        update
-                    }
+                    versionNumber
+                    changelog
+                    createdAt
                 }
             }
+            permissions {
+                delete
+                update
+            }
         }
-        """
-
-        variables: dict[str, Any] = {
-            "page": page,
-            "perPage": per_page,
-        }
-
-        if search:
-            variables["search"] = search
-        if functional_type:
-            variables["functionalType"] = functional_type.upper()
-        if is_validated is not None:
-            variables["isValidated"] = is_validated
-        if tags:
-            variables["tags"] = tags
-        if order_by:
-            variables["orderBy"] = order_by
-
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
-
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-
-        templates_data = response_data.get("data", {}).get("pipelineTemplates", {})
-
-        return {
-            "templates": templates_data.get("items", []),
-            "total_pages": templates_data.get("totalPages", 0),
-            "total_items": templates_data.get("totalItems", 0),
-            "current_page": templates_data.get("pageNumber", page),
-            "per_page": per_page,
-            "count": len(templates_data.get("items", [])),
-        }
-
-    except Exception as e:
-        return {"error": f"Failed to list pipeline templates: {str(e)}"}
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def get_pipeline_template_by_code(template_code: str) -> dict[str, Any]:
     """
     Get detailed information about a specific pipeline template.
@@ -1377,87 +2227,78 @@ def get_pipeline_template_by_code(template_code: str) -> dict[str, Any]:
         - template.versions[] (list of all versions with their IDs)
         - template.organization, workspace, tags
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure credentials."}
+    query = _Q_TEMPLATE_BY_CODE
+
+    variables = {"code": template_code}
+
+    response_data = _cached_execute(query, variables)
 
-    try:
-        query = """
-        query getTemplateByCode($code: String!) {
-            templateByCode(code: $code) {
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+
+    template = response_data["data"].get("templateByCode")
+
+    if not template:
+        return {"error": f"Template with code '{template_code}' not found"}
+
+    return {"template": template}
+
+
+_Q_TEMPLATE_VERSION = """
+    query getTemplateVersion($id: UUID!) {
+        pipelineTemplateVersion(id: $id) {
+            id
+            versionNumber
+            changelog
+            createdAt
+            isLatestVersion
+            user {
+                id
+                displayName
+                email
+            }
+            template {
                 id
                 name
                 code
                 description
-                config
                 functionalType
-                pipelinesCount
-                validatedAt
-                updatedAt
-                tags {
-                    id
+            }
+            sourcePipelineVersion {
+                id
+                versionName
+                versionNumber
+                description
+                parameters {
+                    code
                     name
+                    type
+                    required
+                    default
+                    help
                 }
-                organization {
+                files {
                     id
                     name
+                    path
+                    type
+                    content
+                    language
+                    lineCount
+                    autoSelect
                 }
-                workspace {
-                    slug
-                    name
-                }
-                currentVersion {
-                    id
-                    versionNumber
-                    changelog
-                    createdAt
-                    isLatestVersion
-                    user {
-                        id
-                        displayName
-                        email
-                    }
-                    sourcePipelineVersion {
-                        id
-                        versionName
-                    }
-                }
-                versions(page: 1, perPage: 10) {
-                    totalItems
-                    items {
-                        id
-                        versionNumber
-                        changelog
-                        createdAt
-                    }
-                }
-                permissions {
-                    delete
-                    update
-                }
+            }
+            permissions {
+                update
+                delete
             }
         }
-        """
-
-        variables = {"code": template_code}
-
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
-
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-
-        template = response_data.get("data", {}).get("templateByCode")
-
-        if not template:
-            return {"error": f"Template with code '{template_code}' not found"}
-
-        return {"template": template}
-
-    except Exception as e:
-        return {"error": f"Failed to get template: {str(e)}"}
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def get_pipeline_template_version(version_id: str) -> dict[str, Any]:
     """
     Get the actual source code of a pipeline template version.
@@ -1481,82 +2322,58 @@ def get_pipeline_template_version(version_id: str) -> dict[str, Any]:
             - files[].language (e.g., "python")
             - files[].type ("file" or "directory")
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure credentials."}
+    query = _Q_TEMPLATE_VERSION
 
-    try:
-        query = """
-        query getTemplateVersion($id: UUID!) {
-            pipelineTemplateVersion(id: $id) {
+    variables = {"id": version_id}
+
+    response_data = _cached_execute(query, variables)
+
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
+
+    version = response_data["data"].get("pipelineTemplateVersion")
+
+    if not version:
+        return {"error": f"Template version '{version_id}' not found"}
+
+    return {"version": version}
+
+
+_M_CREATE_PIPELINE_FROM_TEMPLATE = """
+    mutation createPipelineFromTemplate(
+        $input: CreatePipelineFromTemplateVersionInput!
+    ) {
+        createPipelineFromTemplateVersion(input: $input) {
+            success
+            errors
+            pipeline {
                 id
-                versionNumber
-                changelog
-                createdAt
-                isLatestVersion
-                user {
-                    id
-                    displayName
-                    email
+                name
+                code
+                type
+                description
+                workspace {
+                    slug
+                    name
                 }
-                template {
+                sourceTemplate {
                     id
                     name
                     code
-                    description
-                    functionalType
                 }
-                sourcePipelineVersion {
+                currentVersion {
                     id
-                    versionName
                     versionNumber
-                    description
-                    parameters {
-                        code
-                        name
-                        type
-                        required
-                        default
-                        help
-                    }
-                    files {
-                        id
-                        name
-                        path
-                        type
-                        content
-                        language
-                        lineCount
-                        autoSelect
-                    }
-                }
-                permissions {
-                    update
-                    delete
+                    versionName
                 }
             }
         }
-        """
-
-        variables = {"id": version_id}
-
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
-
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
-
-        version = response_data.get("data", {}).get("pipelineTemplateVersion")
-
-        if not version:
-            return {"error": f"Template version '{version_id}' not found"}
-
-        return {"version": version}
-
-    except Exception as e:
-        return {"error": f"Failed to get template version: {str(e)}"}
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def create_pipeline_from_template(
     workspace_slug: str,
     template_version_id: str,
@@ -1583,83 +2400,46 @@ def create_pipeline_from_template(
         - pipeline.currentVersion (the created version)
         - pipeline.sourceTemplate (reference to original template)
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure credentials."}
-
-    try:
-        mutation = """
-        mutation createPipelineFromTemplate(
-            $input: CreatePipelineFromTemplateVersionInput!
-        ) {
-            createPipelineFromTemplateVersion(input: $input) {
-                success
-                errors
-                pipeline {
-                    id
-                    name
-                    code
-                    type
-                    description
-                    workspace {
-                        slug
-                        name
-                    }
-                    sourceTemplate {
-                        id
-                        name
-                        code
-                    }
-                    currentVersion {
-                        id
-                        versionNumber
-                        versionName
-                    }
-                }
-            }
-        }
-        """
+    mutation = _M_CREATE_PIPELINE_FROM_TEMPLATE
 
-        variables = {
-            "input": {
-                "workspaceSlug": workspace_slug,
-                "pipelineTemplateVersionId": template_version_id,
-            }
+    variables = {
+        "input": {
+            "workspaceSlug": workspace_slug,
+            "pipelineTemplateVersionId": template_version_id,
         }
+    }
 
-        result = openhexa.execute(query=mutation, variables=variables)
-        response_data = result.json()
-
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
+    result = openhexa.execute(query=mutation, variables=variables)
+    response_data = _parse(result)
 
-        create_result = response_data.get("data", {}).get("createPipelineFromTemplateVersion", {})
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
 
-        if not create_result.get("success"):
-            errors = create_result.get("errors", [])
-            error_msg = f"Failed to create pipeline from template: {errors}"
+    create_result = response_data["data"].get("createPipelineFromTemplateVersion", {})
 
-            if "PERMISSION_DENIED" in errors:
-                error_msg += "\nYou don't have permission to create pipelines."
-            elif "WORKSPACE_NOT_FOUND" in errors:
-                error_msg += f"\nWorkspace '{workspace_slug}' not found."
-            elif "PIPELINE_TEMPLATE_VERSION_NOT_FOUND" in errors:
-                error_msg += f"\nTemplate version '{template_version_id}' not found."
+    if not create_result.get("success"):
+        errors = create_result.get("errors", [])
+        error_msg = f"Failed to create pipeline from template: {errors}"
 
-            return {"error": error_msg}
+        if "PERMISSION_DENIED" in errors:
+            error_msg += "\nYou don't have permission to create pipelines."
+        elif "WORKSPACE_NOT_FOUND" in errors:
+            error_msg += f"\nWorkspace '{workspace_slug}' not found."
+        elif "PIPELINE_TEMPLATE_VERSION_NOT_FOUND" in errors:
+            error_msg += f"\nTemplate version '{template_version_id}' not found."
 
-        pipeline = create_result.get("pipeline")
+        return {"error": error_msg}
 
-        return {
-            "success": True,
-            "pipeline": pipeline,
-            "message": (
-                f"Pipeline '{pipeline.get('name')}' created successfully "
-                f"from template in workspace '{workspace_slug}'"
-            ),
-        }
+    pipeline = create_result.get("pipeline")
 
-    except Exception as e:
-        return {"error": f"Failed to create pipeline from template: {str(e)}"}
+    return {
+        "success": True,
+        "pipeline": pipeline,
+        "message": (
+            f"Pipeline '{pipeline.get('name')}' created successfully "
+            f"from template in workspace '{workspace_slug}'"
+        ),
+    }
 
 
 # =============================================================================
@@ -1667,7 +2447,39 @@ def create_pipeline_from_template(
 # =============================================================================
 
 
+_M_UPDATE_PIPELINE_SCHEDULE = """
+    mutation updatePipelineSchedule($input: UpdatePipelineInput!) {
+        updatePipeline(input: $input) {
+            success
+            errors
+            pipeline {
+                id
+                name
+                code
+                schedule
+                currentVersion {
+                    id
+                    versionNumber
+                    parameters {
+                        code
+                        name
+                        type
+                        required
+                        default
+                    }
+                }
+                workspace {
+                    slug
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
 @mcp.tool
+@require_sdk
 def schedule_pipeline(
     pipeline_id: str,
     cron_expression: str | None = None,
@@ -1700,94 +2512,92 @@ def schedule_pipeline(
         - pipeline: Updated pipeline with schedule info
         - message: Description of what was done
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure credentials."}
+    # If disabled or no cron expression, we're disabling the schedule
+    schedule_value = cron_expression if enabled and cron_expression else None
 
-    try:
-        # If disabled or no cron expression, we're disabling the schedule
-        schedule_value = cron_expression if enabled and cron_expression else None
+    mutation = _M_UPDATE_PIPELINE_SCHEDULE
 
-        mutation = """
-        mutation updatePipelineSchedule($input: UpdatePipelineInput!) {
-            updatePipeline(input: $input) {
-                success
-                errors
-                pipeline {
-                    id
-                    name
-                    code
-                    schedule
-                    currentVersion {
-                        id
-                        versionNumber
-                        parameters {
-                            code
-                            name
-                            type
-                            required
-                            default
-                        }
-                    }
-                    workspace {
-                        slug
-                        name
-                    }
-                }
-            }
+    variables = {
+        "input": {
+            "id": pipeline_id,
+            "schedule": schedule_value,
         }
-        """
+    }
 
-        variables = {
-            "input": {
-                "id": pipeline_id,
-                "schedule": schedule_value,
-            }
-        }
+    result = openhexa.execute(query=mutation, variables=variables)
+    response_data = _parse(result)
 
-        result = openhexa.execute(query=mutation, variables=variables)
-        response_data = result.json()
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
 
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
+    update_result = response_data["data"].get("updatePipeline", {})
 
-        update_result = response_data.get("data", {}).get("updatePipeline", {})
+    if not update_result.get("success"):
+        errors = update_result.get("errors", [])
+        error_msg = f"Failed to update pipeline schedule: {errors}"
 
-        if not update_result.get("success"):
-            errors = update_result.get("errors", [])
-            error_msg = f"Failed to update pipeline schedule: {errors}"
+        if "PERMISSION_DENIED" in errors:
+            error_msg += "\nYou don't have permission to schedule this pipeline."
+        elif "NOT_FOUND" in errors:
+            error_msg += f"\nPipeline '{pipeline_id}' not found."
+        elif "MISSING_VERSION_CONFIG" in errors:
+            error_msg += (
+                "\nPipeline is not schedulable. All required parameters must have "
+                "default values or be configured. Check pipeline parameters."
+            )
 
-            if "PERMISSION_DENIED" in errors:
-                error_msg += "\nYou don't have permission to schedule this pipeline."
-            elif "NOT_FOUND" in errors:
-                error_msg += f"\nPipeline '{pipeline_id}' not found."
-            elif "MISSING_VERSION_CONFIG" in errors:
-                error_msg += (
-                    "\nPipeline is not schedulable. All required parameters must have "
-                    "default values or be configured. Check pipeline parameters."
-                )
+        return {"error": error_msg}
 
-            return {"error": error_msg}
+    pipeline = update_result.get("pipeline")
+    pipeline_name = pipeline.get("name", pipeline_id)
 
-        pipeline = update_result.get("pipeline")
-        pipeline_name = pipeline.get("name", pipeline_id)
+    if schedule_value:
+        message = f"Pipeline '{pipeline_name}' scheduled with CRON: {schedule_value}"
+    else:
+        message = f"Pipeline '{pipeline_name}' schedule disabled"
 
-        if schedule_value:
-            message = f"Pipeline '{pipeline_name}' scheduled with CRON: {schedule_value}"
-        else:
-            message = f"Pipeline '{pipeline_name}' schedule disabled"
+    return {
+        "success": True,
+        "pipeline": pipeline,
+        "schedule": schedule_value,
+        "message": message,
+    }
 
-        return {
-            "success": True,
-            "pipeline": pipeline,
-            "schedule": schedule_value,
-            "message": message,
-        }
 
-    except Exception as e:
-        return {"error": "Failed to schedule pipeline: " + str(e)}
+_Q_PIPELINE_SCHEDULE = """
+    query getPipelineSchedule($workspaceSlug: String!, $code: String!) {
+        pipelineByCode(workspaceSlug: $workspaceSlug, code: $code) {
+            id
+            name
+            code
+            schedule
+            currentVersion {
+                id
+                versionNumber
+                parameters {
+                    code
+                    name
+                    type
+                    required
+                    default
+                    help
+                }
+            }
+            permissions {
+                schedule
+                update
+            }
+            workspace {
+                slug
+                name
+            }
+        }
+    }
+"""
 
 
 @mcp.tool
+@require_sdk
 def get_pipeline_schedule(
     workspace_slug: str,
     pipeline_code: str,
@@ -1807,82 +2617,52 @@ def get_pipeline_schedule(
         - parameters: List of pipeline parameters (to understand scheduling requirements)
         - can_schedule: Whether user has permission to schedule
     """
-    if not OPENHEXA_AVAILABLE:
-        return {"error": "OpenHEXA SDK not available. Please configure credentials."}
-
-    try:
-        query = """
-        query getPipelineSchedule($workspaceSlug: String!, $code: String!) {
-            pipelineByCode(workspaceSlug: $workspaceSlug, code: $code) {
-                id
-                name
-                code
-                schedule
-                currentVersion {
-                    id
-                    versionNumber
-                    parameters {
-                        code
-                        name
-                        type
-                        required
-                        default
-                        help
-                    }
-                }
-                permissions {
-                    schedule
-                    update
-                }
-                workspace {
-                    slug
-                    name
-                }
-            }
-        }
-        """
-
-        variables = {
-            "workspaceSlug": workspace_slug,
-            "code": pipeline_code,
-        }
-
-        result = openhexa.execute(query=query, variables=variables)
-        response_data = result.json()
+    query = _Q_PIPELINE_SCHEDULE
 
-        if "errors" in response_data:
-            return {"error": f"GraphQL error: {response_data['errors']}"}
+    variables = {
+        "workspaceSlug": workspace_slug,
+        "code": pipeline_code,
+    }
 
-        pipeline = response_data.get("data", {}).get("pipelineByCode")
-
-        if not pipeline:
-            return {
-                "error": f"Pipeline '{pipeline_code}' not found in workspace '{workspace_slug}'"
-            }
+    response_data = _cached_execute(query, variables)
 
-        current_version = pipeline.get("currentVersion", {}) or {}
-        parameters = current_version.get("parameters", [])
+    if "errors" in response_data:
+        return {"error": f"GraphQL error: {response_data['errors']}"}
 
-        # Determine if pipeline is schedulable based on parameters
-        # A pipeline is schedulable if all required parameters have defaults
-        is_schedulable = all(
-            not param.get("required") or param.get("default") is not None for param in parameters
-        )
+    pipeline = response_data["data"].get("pipelineByCode")
 
+    if not pipeline:
         return {
-            "pipeline_id": pipeline.get("id"),
-            "name": pipeline.get("name"),
-            "code": pipeline.get("code"),
-            "schedule": pipeline.get("schedule"),
-            "is_scheduled": pipeline.get("schedule") is not None,
-            "is_schedulable": is_schedulable,
-            "parameters": parameters,
-            "can_schedule": pipeline.get("permissions", {}).get("schedule", False),
-            "workspace": pipeline.get("workspace"),
+            "error": f"Pipeline '{pipeline_code}' not found in workspace '{workspace_slug}'"
         }
 
-    except Exception as e:
-        return {"error": "Failed to get pipeline schedule: " + str(e)}
+    current_version = pipeline.get("currentVersion", {}) or {}
+    parameters = current_version.get("parameters", [])
+
+    # Determine if pipeline is schedulable based on parameters
+    # A pipeline is schedulable if all required parameters have defaults
+    is_schedulable = all(
+        not param.get("required") or param.get("default") is not None for param in parameters
+    )
+
+    return {
+        "pipeline_id": pipeline.get("id"),
+        "name": pipeline.get("name"),
+        "code": pipeline.get("code"),
+        "schedule": pipeline.get("schedule"),
+        "is_scheduled": pipeline.get("schedule") is not None,
+        "is_schedulable": is_schedulable,
+        "parameters": parameters,
+        "can_schedule": pipeline.get("permissions", {}).get("schedule", False),
+        "workspace": pipeline.get("workspace"),
+    }
+
+
+# Pre-warm the persisted-query hash memo for every static document so the
+# first call of each tool skips the sha256 computation.
+for _document in [value for name, value in list(globals().items()) if name.startswith(("_Q_", "_M_"))]:
+    _query_hash(_document)
+del _document
 
 
 def main():